@@ -27,14 +27,15 @@ class GLTFImage(object):
             bufferview = gltf_loader.json_data['bufferViews'][image_entry['bufferView']]
             buffer = gltf_loader.json_data['buffers'][bufferview['buffer']]
 
-            buff = BytesIO()
             if not gltf_loader.binary:
+                buff = BytesIO()
                 img_base64 = buffer['uri'].split(',')[1]
                 buff.write(base64.b64decode(img_base64))
+                buff.seek(bufferview.get('byteOffset', 0))
+                image_data = buff.read(bufferview['byteLength'])
             else:
-                buff.write(buffer['data'])
-            buff.seek(bufferview.get('byteOffset', 0))
-            img = Image.open(BytesIO(buff.read(bufferview['byteLength'])))
+                image_data = gltf_loader.get_buffer_view_data(bufferview)
+            img = Image.open(BytesIO(image_data))
             # NOTE: image might not have a name
             self._name = image_entry['name'] if 'name' in image_entry else 'image_{}.{}'.format(image_index, img.format.lower())
             if "." not in self._name:
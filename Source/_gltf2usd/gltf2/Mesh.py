@@ -43,7 +43,7 @@ class PrimitiveTarget(object):
             accessor = gltf_loader.json_data['accessors'][target_entry[entry]]
             if self._name == None:
                 self._name = accessor['name'] if ('name' in accessor) else 'shape_{}'.format(target_index)
-            data = gltf_loader.get_data(accessor, target_entry[entry])
+            data = gltf_loader.get_data_as_tuples(accessor, target_entry[entry])
             self._attributes[entry] = data
 
     def get_attributes(self):
@@ -64,7 +64,7 @@ class Primitive(object):
             for attribute_name in primitive_entry['attributes']:
                 accessor_index = primitive_entry['attributes'][attribute_name]
                 accessor = gltf_loader.json_data['accessors'][accessor_index]
-                data = gltf_loader.get_data(accessor, accessor_index)
+                data = gltf_loader.get_data_as_tuples(accessor, accessor_index)
                 if data:
                     min_value = accessor['min'] if ('min' in accessor) else None
                     max_value = accessor['max'] if ('max' in accessor) else None
@@ -86,7 +86,7 @@ class Primitive(object):
         if 'indices' in primitive_entry:
             accessor_index = primitive_entry['indices']
             accessor = gltf_loader.json_data['accessors'][accessor_index]
-            data = gltf_loader.get_data(accessor, accessor_index)
+            data = gltf_loader.get_data_as_tuples(accessor, accessor_index)
             return data
 
         else:
@@ -22,8 +22,8 @@ class Node(object):
         
         self._mesh = gltf_loader.get_meshes()[node_dict['mesh']] if ('mesh' in node_dict) else None
         
-        self._children_indices = node_dict['children'] if ('children' in node_dict) else []
-        self._children = []
+        self._gltf_loader = gltf_loader
+        self._children_indices = tuple(node_dict['children']) if ('children' in node_dict) else ()
         self._extras = node_dict['extras'] if 'extras' in node_dict else {}
 
     @property
@@ -42,6 +42,16 @@ class Node(object):
     def scale(self):
         return self._scale
 
+    @property
+    def _children(self):
+        """The child nodes, resolved from the loader on access
+        
+        Returns:
+            [Node] -- list of child nodes
+        """
+
+        return [self._gltf_loader.nodes[child_index] for child_index in self._children_indices]
+
     def get_children(self):
         return self._children
 
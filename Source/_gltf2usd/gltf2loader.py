@@ -2,6 +2,7 @@ import codecs
 from enum import Enum
 import base64
 import json
+import mmap
 import os
 import re
 import struct
@@ -12,7 +13,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 import numpy as np
-from io import BytesIO
+
+_DATA_URI_RE = re.compile(r'^data:.*?;base64,')
+
+# use orjson when it is installed, it parses large glTF documents considerably faster
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 import gltf2usdUtils
 
@@ -64,16 +73,18 @@ class AccessorTypeCount(Enum):
     MAT3 = 9
     MAT4 = 16
 
+_ACCESSOR_TYPE_COUNT = {
+    'SCALAR': 1,
+    'VEC2': 2,
+    'VEC3': 3,
+    'VEC4': 4,
+    'MAT2': 4,
+    'MAT3': 9,
+    'MAT4': 16
+}
+
 def accessor_type_count(x):
-    return {
-        'SCALAR': 1,
-        'VEC2': 2,
-        'VEC3': 3,
-        'VEC4': 4,
-        'MAT2': 4,
-        'MAT3': 9,
-        'MAT4': 16
-    }[x]
+    return _ACCESSOR_TYPE_COUNT[x]
 
 def PrimitiveMode(Enum):
     POINTS = 0
@@ -94,17 +105,72 @@ def accessor_component_type_bytesize(x):
         AccessorComponentType.FLOAT: 4,
     }[x]
 
+# numpy dtype of each accessor component type, glTF binary data is always little-endian
+_COMP_DTYPE = {
+    AccessorComponentType.BYTE.value: np.dtype('<i1'),
+    AccessorComponentType.UNSIGNED_BYTE.value: np.dtype('<u1'),
+    AccessorComponentType.SHORT.value: np.dtype('<i2'),
+    AccessorComponentType.UNSIGNED_SHORT.value: np.dtype('<u2'),
+    AccessorComponentType.UNSIGNED_INT.value: np.dtype('<u4'),
+    AccessorComponentType.FLOAT.value: np.dtype('<f4'),
+}
+
+# divisor applied to normalized integer accessor components
+_COMP_NORM = {
+    AccessorComponentType.BYTE.value: 127.0,
+    AccessorComponentType.UNSIGNED_BYTE.value: 255.0,
+    AccessorComponentType.SHORT.value: 32767.0,
+    AccessorComponentType.UNSIGNED_SHORT.value: 65535.0,
+}
+
+
+def _map_file(path):
+    """Memory maps a file read-only
+
+    Arguments:
+        path {str} -- path of the file
+
+    Returns:
+        mmap -- read-only mapping of the whole file
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
 
 def load_uri(s, folder=None):
     if s.startswith('data:'):
         return base64.b64decode(s[s.index(',') + 1:])
 
     if s.startswith('http'):
-        r = requests.get(s)
-        if r.status_code >= 400:
-            logger.warning('Unable to fetch http uri')
-            return
-        return r.content
+        r = requests.get(s, stream=True)
+        try:
+            if r.status_code >= 400:
+                logger.warning('Unable to fetch http uri')
+                return
+            content_length = int(r.headers.get('Content-Length', 0))
+            if not content_length or 'Content-Encoding' in r.headers:
+                # the decoded size is unknown up front
+                return r.content
+
+            # stream straight into a preallocated buffer instead of holding a second copy of the response
+            data = bytearray(content_length)
+            view = memoryview(data)
+            offset = 0
+            for chunk in r.iter_content(1 << 20):
+                if offset + len(chunk) > content_length:
+                    logger.warning('Unable to fetch http uri, received more than the expected {} bytes'.format(content_length))
+                    return
+                view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            if offset != content_length:
+                logger.warning('Unable to fetch http uri, expected {} bytes but received {}'.format(content_length, offset))
+                return
+            return data
+        finally:
+            r.close()
 
     if folder:
         s = os.path.join(folder, s)
@@ -130,7 +196,11 @@ class GLTF2Loader(object):
 
         self.usdz_profile = usdz_profile  # type: USDZProfile
         self._accessor_data_map = {}
+        self._accessor_key_map = {}
         self.root_dir = os.path.dirname(gltf_file)
+        self._gltf_file = gltf_file
+        self._glb_binary_chunk_offset = None
+        self._buffers_released = False
         self._optimize_textures = optimize_textures
         self._generate_texture_transform_texture = generate_texture_transform_texture
 
@@ -140,43 +210,41 @@ class GLTF2Loader(object):
             BINARY_CHUNK = 0x004E4942
 
             with open(gltf_file, 'rb') as f:
-                file_buffer = BytesIO(f.read())
+                file_buffer = f.read()
 
-            file_buffer.seek(0)
-            magic, glb_version, file_size = np.frombuffer(file_buffer.read(12), dtype='uint32')
+            magic, glb_version, file_size = struct.unpack_from('<III', file_buffer, 0)
             if magic == MAGIC:
                 if glb_version != 2:
                     raise NotImplementedError('Only glb version 2 is supported!')
-                total_bytes_read = 12
-                while True:
-                    header_bytes = file_buffer.read(8)
-                    if not header_bytes:
-                        if total_bytes_read != file_size:
-                            raise ValueError('Expected ' + file_size + ' bytes' +
-                                             ' but only read ' + total_bytes_read)
-                        break
-                    total_bytes_read += 8
-                    chunk_size, chunk_type = np.frombuffer(header_bytes, dtype='uint32')
-                    chunk = file_buffer.read(int(chunk_size))
-                    total_bytes_read += chunk_size
+                # walk the chunk headers in place with a running offset
+                offset = 12
+                while offset < len(file_buffer):
+                    chunk_size, chunk_type = struct.unpack_from('<II', file_buffer, offset)
+                    chunk_offset = offset + 8
+                    offset = chunk_offset + chunk_size
                     if chunk_type == JSON_CHUNK:
-                        self.json_data = json.loads(chunk.decode('utf-8'))
+                        self.json_data = _loads(file_buffer[chunk_offset:offset])
                     elif chunk_type == BINARY_CHUNK:
                         buffer = self.json_data['buffers'][0]
                         if buffer.get('uri'):
                             buffer['data'] = load_uri(buffer['uri'], folder=self.root_dir)
                         else:
-                            buffer['data'] = bytearray(chunk)[:buffer['byteLength']]
+                            # zero-copy uint8 view of the chunk, numpy reads it on Python 2 unlike a memoryview
+                            buffer['data'] = np.frombuffer(file_buffer, dtype=np.uint8, count=buffer['byteLength'],
+                                                           offset=chunk_offset)
+                            self._glb_binary_chunk_offset = chunk_offset
                     else:
-                        raise TypeError('Invalid chunk type: ' + chunk_type)
+                        raise TypeError('Invalid chunk type: {}'.format(chunk_type))
+                if offset != file_size:
+                    raise ValueError('Expected {} bytes but only read {}'.format(file_size, offset))
             self.binary = True
         else:
             try:
                 with codecs.open(gltf_file, encoding='utf-8', errors='strict') as f:
-                    self.json_data = json.load(f)
+                    self.json_data = _loads(f.read())
             except UnicodeDecodeError:
                 with open(gltf_file) as f:
-                    self.json_data = json.load(f)
+                    self.json_data = _loads(f.read())
             self.binary = False
 
         self._initialize()
@@ -193,6 +261,7 @@ class GLTF2Loader(object):
         self._initialize_scenes()
         
         self._initialize_animations()
+        self._release_buffers()
 
     def _initialize_asset(self):
         if 'asset' in self.json_data:
@@ -214,13 +283,10 @@ class GLTF2Loader(object):
                 node = Node(node_entry, i, self)
                 self.nodes.append(node)
 
-            for i, node_entry in enumerate(self.json_data['nodes']):
-                if 'children' in node_entry:
-                    parent = self.nodes[i]
-                    for child_index in node_entry['children']:
-                        child = self.nodes[child_index]
-                        child._parent = parent
-                        parent._children.append(child)
+            # children are resolved lazily from their indices, only the parents need linking
+            for parent in self.nodes:
+                for child_index in parent._children_indices:
+                    self.nodes[child_index]._parent = parent
 
     def _initialize_materials(self):
         self._materials = []
@@ -313,77 +379,181 @@ class GLTF2Loader(object):
         remainder = value % size
         return value if (remainder == 0) else (value + size - remainder)
 
+    def _get_buffer_bytes(self, buffer):
+        """Returns the contents of a glTF buffer.  Data-uris are decoded, http uris fetched and
+        external files memory mapped the first time the buffer is accessed, and the result is
+        cached on the buffer so every accessor reading from it shares it.  Once the loader has
+        released its buffers, reloaded contents are returned without being cached again
+
+        Arguments:
+            buffer {dict} -- glTF buffer
+
+        Returns:
+            str|bytearray|mmap -- contents of the buffer, passed to numpy as is
+        """
+        if 'data' in buffer:
+            return buffer['data']
+
+        uri = buffer.get('uri')
+        if uri is None:
+            # binary chunk of a .glb file that has been released, map it from the file instead
+            offset = self._glb_binary_chunk_offset
+            buffer_data = np.frombuffer(_map_file(self._gltf_file), dtype=np.uint8,
+                                        count=buffer['byteLength'], offset=offset)
+        elif _DATA_URI_RE.match(uri):
+            buffer_data = base64.b64decode(uri[uri.index(',') + 1:])
+        elif uri.startswith('http'):
+            buffer_data = load_uri(uri)
+            if buffer_data is None:
+                raise Exception('Unable to load buffer {}'.format(uri))
+        else:
+            buffer_data = _map_file(os.path.join(self.root_dir, uri))
+
+        if not self._buffers_released:
+            buffer['data'] = buffer_data
+        return buffer_data
+
+    def get_buffer_data(self, buffer):
+        """Returns the contents of a glTF buffer, loading it again if it has been released
+
+        Arguments:
+            buffer {dict} -- glTF buffer
+
+        Returns:
+            str|bytearray|mmap -- contents of the buffer
+        """
+        return self._get_buffer_bytes(buffer)
+
+    def get_buffer_view_data(self, bufferview, buffer_data=None):
+        """Returns a copy of the bytes of a glTF bufferView
+
+        Arguments:
+            bufferview {dict} -- glTF bufferView
+            buffer_data {str|bytearray|mmap} -- contents of the buffer as returned by get_buffer_data, so
+            callers reading several bufferViews only load the buffer once (default: {None}, loads the buffer)
+
+        Returns:
+            str -- bytes of the bufferView
+        """
+        if buffer_data is None:
+            buffer_data = self.get_buffer_data(self.json_data['buffers'][bufferview['buffer']])
+
+        return np.frombuffer(buffer_data, dtype=np.uint8, count=bufferview['byteLength'],
+                             offset=bufferview.get('byteOffset', 0)).tobytes()
+
+    def _release_buffers(self):
+        """Releases the raw buffer contents once the loader is initialized, the decoded accessor
+        data is kept in the accessor cache
+        """
+        # animation samplers fetch their data lazily, so decode every accessor while the buffers are loaded
+        for i, accessor in enumerate(self.json_data.get('accessors', [])):
+            if 'bufferView' in accessor:
+                self.get_data(accessor, i)
+
+        buffers = self.json_data.get('buffers', [])
+        for accessor_key, data_arr in self._accessor_data_map.items():
+            buffer = buffers[self.json_data['bufferViews'][accessor_key[0]]['buffer']]
+            base = data_arr
+            while isinstance(base, np.ndarray):
+                base = base.base
+            # arrays viewing an in-memory buffer would keep all of it alive, memory mapped files can stay
+            if base is not None and not isinstance(buffer.get('data'), mmap.mmap):
+                data_arr = data_arr.copy()
+                data_arr.flags.writeable = False
+                self._accessor_data_map[accessor_key] = data_arr
+
+        for buffer in buffers:
+            buffer.pop('data', None)
+        self._buffers_released = True
+
     def get_data(self, accessor, accessor_index):
-        if accessor_index in self._accessor_data_map.keys():
-            return self._accessor_data_map[accessor_index]
+        """Decodes the data of an accessor
+
+        Arguments:
+            accessor {dict} -- glTF accessor
+            accessor_index {int} -- index of the accessor
+
+        Returns:
+            numpy.ndarray -- accessor data, of shape (count,) for scalar accessors and
+            (count, component count) otherwise
+        """
+        if accessor_index in self._accessor_key_map:
+            return self._accessor_data_map[self._accessor_key_map[accessor_index]]
+
+        # accessors reading the same range of the same bufferView share their decoded data
+        accessor_key = (accessor['bufferView'], accessor.get('byteOffset', 0), accessor['componentType'],
+                        accessor['type'], accessor['count'], accessor.get('normalized', False))
+        if accessor_key in self._accessor_data_map:
+            self._accessor_key_map[accessor_index] = accessor_key
+            return self._accessor_data_map[accessor_key]
 
         bufferview = self.json_data['bufferViews'][accessor['bufferView']]
         buffer = self.json_data['buffers'][bufferview['buffer']]
-        accessor_type = AccessorType(accessor['type'])
-        if not self.binary:
-            uri = buffer['uri']
-        buffer_data = ''
-
-        if self.binary:
-            buffer_data = buffer['data']
-            if 'byteOffset' in bufferview:
-                buffer_data = buffer_data[bufferview['byteOffset']:]
-
-        elif re.match(r'^data:.*?;base64,', uri):
-            uri_data = uri.split(',')[1]
-            buffer_data = base64.b64decode(uri_data)
-            if 'byteOffset' in bufferview:
-                buffer_data = buffer_data[bufferview['byteOffset']:]
-        else:
-            buffer_file = os.path.join(self.root_dir, uri)
-            with open(buffer_file, 'rb') as buffer_fptr:
-                if 'byteOffset' in bufferview:
-                    buffer_fptr.seek(bufferview['byteOffset'], 1)
-
-                buffer_data = buffer_fptr.read(bufferview['byteLength'])
+        buffer_data = self._get_buffer_bytes(buffer)
 
-        data_arr = []
-        accessor_component_type = AccessorComponentType(accessor['componentType'])
+        component_type = accessor['componentType']
+        if component_type not in _COMP_DTYPE:
+            raise Exception('unsupported accessor component type!')
+        dtype = _COMP_DTYPE[component_type]
+        # only integer components are normalized, everything else keeps its native dtype
+        normalized = accessor.get('normalized', False) and component_type in _COMP_NORM
 
-        accessor_type_size = accessor_type_count(accessor['type'])
-        accessor_component_type_size = accessor_component_type_bytesize(accessor_component_type)
+        accessor_type_size = _ACCESSOR_TYPE_COUNT[accessor['type']]
+        accessor_component_type_size = dtype.itemsize
 
         bytestride = int(bufferview['byteStride']) if ('byteStride' in bufferview) else (
                     accessor_type_size * accessor_component_type_size)
-        offset = int(accessor['byteOffset']) if 'byteOffset' in accessor else 0
-
-        data_type = ''
-        data_type_size = 4
-        normalize_divisor = 1.0  # used if the value needs to be normalized
-        if accessor_component_type == AccessorComponentType.FLOAT:
-            data_type = 'f'
-            data_type_size = 4
-        elif accessor_component_type == AccessorComponentType.UNSIGNED_INT:
-            data_type = 'I'
-            data_type_size = 4
-        elif accessor_component_type == AccessorComponentType.UNSIGNED_SHORT:
-            data_type = 'H'
-            data_type_size = 2
-            normalize_divisor = 65535.0 if 'normalized' in accessor and accessor['normalized'] == True else 1.0
-        elif accessor_component_type == AccessorComponentType.UNSIGNED_BYTE:
-            data_type = 'B'
-            data_type_size = 1
-            normalize_divisor = 255.0 if 'normalized' in accessor and accessor['normalized'] == True else 1.0
+        # read in place from the start of the buffer rather than slicing out the bufferView
+        offset = int(bufferview.get('byteOffset', 0)) + int(accessor.get('byteOffset', 0))
+        count = accessor['count']
+
+        if bytestride == accessor_type_size * accessor_component_type_size:
+            # tightly packed accessor, decode the whole range in one call.  Packed floats such as positions
+            # and normals need no normalization or byte swapping, so they stay a view of the buffer
+            data_arr = np.frombuffer(buffer_data, dtype=dtype, count=count * accessor_type_size, offset=offset)
+            data_arr = data_arr.reshape(count, accessor_type_size)
         else:
-            raise Exception('unsupported accessor component type!')
+            # interleaved accessor, gather the strided view into a contiguous array
+            data_arr = np.ndarray((count, accessor_type_size), dtype=dtype, buffer=buffer_data, offset=offset,
+                                  strides=(bytestride, accessor_component_type_size))
+            if not normalized:
+                # the float32 cast below already produces a contiguous copy for normalized data
+                data_arr = np.ascontiguousarray(data_arr)
+
+        if normalized:
+            # cast to float32 and scale in place, so no float64 or temporary array is created
+            data_arr = data_arr.astype(np.float32)
+            data_arr *= np.float32(1.0 / _COMP_NORM[component_type])
+            if dtype.kind == 'i':
+                # the most negative signed value would map below -1.0, glTF clamps it to -1.0
+                np.maximum(data_arr, -1.0, out=data_arr)
+        elif not data_arr.dtype.isnative:
+            # on big-endian hosts swap the whole array at once so consumers get native byte order
+            data_arr = data_arr.byteswap().view(data_arr.dtype.newbyteorder())
+
+        if accessor_type_size == 1:
+            data_arr = data_arr.ravel()
+
+        # the decoded array is shared between accessors, so guard it against in place edits
+        data_arr.flags.writeable = False
+        self._accessor_data_map[accessor_key] = data_arr
+        # only map the index once the data is stored, so a failed decode is retried rather than cached
+        self._accessor_key_map[accessor_index] = accessor_key
+        return data_arr
 
-        for i in range(0, accessor['count']):
-            entries = []
-            for j in range(0, accessor_type_size):
-                x = offset + j * accessor_component_type_size
-                window = buffer_data[x:x + data_type_size]
-                entries.append((struct.unpack(data_type, window)[0]) / normalize_divisor)
+    def get_data_as_tuples(self, accessor, accessor_index):
+        """Returns the data of an accessor as a list of scalars, or a list of tuples for
+        non-scalar accessors
 
-            if len(entries) > 1:
-                data_arr.append(tuple(entries))
-            else:
-                data_arr.append(entries[0])
-            offset = offset + bytestride
+        Arguments:
+            accessor {dict} -- glTF accessor
+            accessor_index {int} -- index of the accessor
 
-        self._accessor_data_map[accessor_index] = data_arr
-        return data_arr
+        Returns:
+            list -- accessor data
+        """
+        data_arr = self.get_data(accessor, accessor_index)
+        if data_arr.ndim == 1:
+            return data_arr.tolist()
+
+        return [tuple(entry) for entry in data_arr.tolist()]
@@ -429,6 +429,8 @@ class GLTF2USD(object):
 
         if 'images' in self.gltf_loader.json_data:
             self.images = []
+            # the loader has released its buffers, so load each one once for all of its images
+            buffers_data = {}
             for i, image in enumerate(self.gltf_loader.json_data['images']):
                 image_name = ''
 
@@ -437,11 +439,11 @@ class GLTF2USD(object):
                     img = None
                     if 'bufferView' in image:
                         buffer_view = self.gltf_loader.json_data['bufferViews'][image['bufferView']]
-                        buffer = self.gltf_loader.json_data['buffers'][buffer_view['buffer']]
-                        buff = BytesIO()
-                        buff.write(buffer['data'])
-                        buff.seek(buffer_view.get('byteOffset', 0))
-                        img = Image.open(BytesIO(buff.read(buffer_view['byteLength'])))
+                        buffer_index = buffer_view['buffer']
+                        if buffer_index not in buffers_data:
+                            buffer = self.gltf_loader.json_data['buffers'][buffer_index]
+                            buffers_data[buffer_index] = self.gltf_loader.get_buffer_data(buffer)
+                        img = Image.open(BytesIO(self.gltf_loader.get_buffer_view_data(buffer_view, buffers_data[buffer_index])))
 
                     # NOTE: image might not have a name
                     image_name = image['name'] if 'name' in image else 'image{}.{}'.format(i, img.format.lower())
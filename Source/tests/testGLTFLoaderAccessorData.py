@@ -0,0 +1,226 @@
+import unittest
+
+import base64
+import json
+import shutil
+import struct
+import sys
+import os
+import tempfile
+from os import path
+sys.path.append( path.dirname( path.dirname( path.abspath(__file__) ) ) )
+
+from _gltf2usd.gltf2loader import GLTF2Loader
+
+# struct format, byte size and normalization divisor of each accessor component type
+COMPONENT_FORMATS = {
+    5120: ('b', 1, 127.0),
+    5121: ('B', 1, 255.0),
+    5122: ('h', 2, 32767.0),
+    5123: ('H', 2, 65535.0),
+    5125: ('I', 4, None),
+    5126: ('f', 4, None),
+}
+
+TYPE_COUNTS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}
+
+
+def struct_decode(json_data, binary, accessor):
+    """Decodes an accessor one component at a time with struct, the way the loader used to
+    """
+    bufferview = json_data['bufferViews'][accessor['bufferView']]
+    data_type, size, divisor = COMPONENT_FORMATS[accessor['componentType']]
+    type_count = TYPE_COUNTS[accessor['type']]
+    stride = bufferview.get('byteStride', type_count * size)
+    offset = bufferview.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+
+    data = []
+    for i in range(accessor['count']):
+        entries = []
+        for j in range(type_count):
+            value = struct.unpack_from('<' + data_type, binary, offset + i * stride + j * size)[0]
+            if accessor.get('normalized', False):
+                value = max(value / divisor, -1.0)
+            entries.append(value)
+        data.append(tuple(entries) if type_count > 1 else entries[0])
+
+    return data
+
+
+def build_buffer():
+    """Builds a binary buffer and the glTF bufferViews and accessors describing it
+    """
+    chunks = []
+    buffer_views = []
+    accessors = []
+
+    def add_buffer_view(data, byte_stride=None):
+        byte_offset = sum(len(chunk) for chunk in chunks)
+        padding = b'\0' * ((4 - byte_offset % 4) % 4)
+        chunks.append(padding)
+        chunks.append(data)
+        buffer_view = {'buffer': 0, 'byteOffset': byte_offset + len(padding), 'byteLength': len(data)}
+        if byte_stride:
+            buffer_view['byteStride'] = byte_stride
+        buffer_views.append(buffer_view)
+        return len(buffer_views) - 1
+
+    # interleaved POSITION (VEC3) and TEXCOORD_0 (VEC2), byteStride 20
+    vertices = [(0.0, 0.0, 0.0, 0.0, 0.0), (1.0, 0.0, 0.0, 1.0, 0.0), (0.0, 1.0, 0.0, 0.0, 1.0),
+                (1.0, 1.0, 0.5, 1.0, 1.0)]
+    view = add_buffer_view(b''.join(struct.pack('<5f', *vertex) for vertex in vertices), byte_stride=20)
+    accessors.append({'bufferView': view, 'componentType': 5126, 'type': 'VEC3', 'count': 4})
+    accessors.append({'bufferView': view, 'byteOffset': 12, 'componentType': 5126, 'type': 'VEC2', 'count': 4})
+
+    # index buffers
+    view = add_buffer_view(struct.pack('<6H', 0, 1, 2, 2, 1, 3))
+    accessors.append({'bufferView': view, 'componentType': 5123, 'type': 'SCALAR', 'count': 6})
+    view = add_buffer_view(struct.pack('<6I', 0, 1, 2, 2, 1, 70000))
+    accessors.append({'bufferView': view, 'componentType': 5125, 'type': 'SCALAR', 'count': 6})
+
+    # normalized u8, u16 and i8 components, including the extremes of each type
+    view = add_buffer_view(struct.pack('<8B', 0, 255, 128, 1, 10, 20, 30, 40))
+    accessors.append({'bufferView': view, 'componentType': 5121, 'type': 'VEC4', 'count': 2, 'normalized': True})
+    view = add_buffer_view(struct.pack('<4H', 0, 65535, 32768, 1))
+    accessors.append({'bufferView': view, 'componentType': 5123, 'type': 'VEC2', 'count': 2, 'normalized': True})
+    view = add_buffer_view(struct.pack('<4b', -128, -127, 0, 127))
+    accessors.append({'bufferView': view, 'componentType': 5120, 'type': 'VEC4', 'count': 1, 'normalized': True})
+
+    # normalized u8 weights interleaved with a byteStride of 8
+    view = add_buffer_view(struct.pack('<16B', *range(0, 256, 16)), byte_stride=8)
+    accessors.append({'bufferView': view, 'byteOffset': 4, 'componentType': 5121, 'type': 'VEC4', 'count': 2,
+                      'normalized': True})
+
+    # second accessor over the u16 index range, it shares the decoded data of accessor 2
+    accessors.append({'bufferView': 1, 'componentType': 5123, 'type': 'SCALAR', 'count': 6})
+
+    binary = b''.join(chunks)
+    binary += b'\0' * ((4 - len(binary) % 4) % 4)
+    return binary, buffer_views, accessors
+
+
+class TestGLTFLoaderAccessorData(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.binary, buffer_views, accessors = build_buffer()
+        cls.json_data = {
+            'asset': {'version': '2.0'},
+            'meshes': [{'primitives': [{'attributes': {'POSITION': 0, 'TEXCOORD_0': 1}, 'indices': 2}]}],
+            'bufferViews': buffer_views,
+            'accessors': accessors,
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def _write_gltf(self, name, buffer_entry):
+        json_data = dict(self.json_data, buffers=[buffer_entry])
+        gltf_file = os.path.join(self.temp_dir, name)
+        with open(gltf_file, 'w') as f:
+            json.dump(json_data, f)
+
+        return gltf_file
+
+    def _load_glb(self):
+        json_chunk = json.dumps(dict(self.json_data, buffers=[{'byteLength': len(self.binary)}])).encode('utf-8')
+        json_chunk += b' ' * ((4 - len(json_chunk) % 4) % 4)
+        file_size = 12 + 8 + len(json_chunk) + 8 + len(self.binary)
+        glb_file = os.path.join(self.temp_dir, 'synthetic.glb')
+        with open(glb_file, 'wb') as f:
+            f.write(struct.pack('<III', 0x46546C67, 2, file_size))
+            f.write(struct.pack('<II', len(json_chunk), 0x4E4F534A) + json_chunk)
+            f.write(struct.pack('<II', len(self.binary), 0x004E4942) + self.binary)
+
+        return GLTF2Loader(glb_file, None)
+
+    def _load_data_uri(self):
+        uri = 'data:application/octet-stream;base64,' + base64.b64encode(self.binary).decode('ascii')
+        return GLTF2Loader(self._write_gltf('data_uri.gltf', {'uri': uri, 'byteLength': len(self.binary)}), None)
+
+    def _load_external_buffer(self):
+        with open(os.path.join(self.temp_dir, 'synthetic.bin'), 'wb') as f:
+            f.write(self.binary)
+
+        return GLTF2Loader(self._write_gltf('external.gltf', {'uri': 'synthetic.bin', 'byteLength': len(self.binary)}), None)
+
+    def _assert_accessor_data(self, loader):
+        for i, accessor in enumerate(self.json_data['accessors']):
+            expected = struct_decode(self.json_data, self.binary, accessor)
+            data = loader.get_data_as_tuples(accessor, i)
+            self.assertEqual(len(data), len(expected))
+            for entry, expected_entry in zip(data, expected):
+                if isinstance(expected_entry, tuple):
+                    self.assertEqual(len(entry), len(expected_entry))
+                    for value, expected_value in zip(entry, expected_entry):
+                        self.assertAlmostEqual(value, expected_value, places=6)
+                else:
+                    self.assertEqual(entry, expected_entry)
+
+    def test_get_data_glb(self):
+        self._assert_accessor_data(self._load_glb())
+
+    def test_get_data_data_uri(self):
+        self._assert_accessor_data(self._load_data_uri())
+
+    def test_get_data_external_buffer(self):
+        self._assert_accessor_data(self._load_external_buffer())
+
+    def test_get_data_shape(self):
+        loader = self._load_glb()
+        self.assertEqual(loader.get_data(self.json_data['accessors'][0], 0).shape, (4, 3))
+        self.assertEqual(loader.get_data(self.json_data['accessors'][2], 2).shape, (6,))
+        self.assertEqual(loader.get_data(self.json_data['accessors'][2], 2).dtype.kind, 'u')
+
+    def test_shared_accessor_range(self):
+        loader = self._load_external_buffer()
+        accessors = self.json_data['accessors']
+        self.assertIs(loader.get_data(accessors[8], 8), loader.get_data(accessors[2], 2))
+
+    def test_failed_decode_is_not_cached(self):
+        loader = self._load_glb()
+        accessor = {'bufferView': 1, 'componentType': 5124, 'type': 'SCALAR', 'count': 1}
+        for _ in range(2):
+            with self.assertRaises(Exception) as context:
+                loader.get_data(accessor, 100)
+            self.assertEqual(str(context.exception), 'unsupported accessor component type!')
+
+    def test_signed_normalized_clamp(self):
+        loader = self._load_data_uri()
+        data = loader.get_data_as_tuples(self.json_data['accessors'][6], 6)
+        self.assertEqual(data[0][0], -1.0)
+        self.assertEqual(data[0][1], -1.0)
+        self.assertEqual(data[0][3], 1.0)
+
+    def test_get_mesh_primitive_indices(self):
+        loader = self._load_glb()
+        primitive = loader.get_meshes()[0].get_primitives()[0]
+        self.assertEqual(primitive.get_indices(), [0, 1, 2, 2, 1, 3])
+
+    def test_get_buffer_view_data(self):
+        loader = self._load_glb()
+        bufferview = self.json_data['bufferViews'][2]
+        byte_offset = bufferview['byteOffset']
+        expected = self.binary[byte_offset:byte_offset + bufferview['byteLength']]
+        self.assertEqual(loader.get_buffer_view_data(bufferview), expected)
+
+        # a buffer passed in by the caller is read as is rather than loaded again
+        buffer_data = loader.get_buffer_data(loader.json_data['buffers'][0])
+        loader.get_buffer_data = lambda buffer: self.fail('buffer loaded again')
+        self.assertEqual(loader.get_buffer_view_data(bufferview, buffer_data), expected)
+
+    def test_release_buffers(self):
+        for loader in (self._load_glb(), self._load_data_uri(), self._load_external_buffer()):
+            buffer = loader.json_data['buffers'][0]
+            self.assertNotIn('data', buffer)
+            self._assert_accessor_data(loader)
+
+            buffer_data = loader.get_buffer_data(buffer)
+            self.assertEqual(bytearray(buffer_data), bytearray(self.binary))
+            self.assertNotIn('data', buffer)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGLTFLoaderAccessorData)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,84 @@
+import unittest
+
+import sys
+from os import path
+sys.path.append( path.dirname( path.dirname( path.abspath(__file__) ) ) )
+
+from _gltf2usd import gltf2loader
+from _gltf2usd.gltf2loader import load_uri
+
+BODY = bytes(bytearray(range(100)))
+
+
+class FakeResponse(object):
+    """Minimal stand-in for a streamed requests response
+    """
+
+    def __init__(self, body, headers, status_code=200):
+        self.content = body
+        self.headers = headers
+        self.status_code = status_code
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        # small chunks so the body is streamed in several pieces
+        for i in range(0, len(self.content), 30):
+            yield self.content[i:i + 30]
+
+    def close(self):
+        self.closed = True
+
+
+class TestLoadUri(unittest.TestCase):
+    def setUp(self):
+        self._requests_get = gltf2loader.requests.get
+        self.response = None
+
+    def tearDown(self):
+        gltf2loader.requests.get = self._requests_get
+
+    def _respond_with(self, body, headers, status_code=200):
+        self.response = FakeResponse(body, headers, status_code)
+
+        def fake_get(url, stream=False):
+            self.assertTrue(stream)
+            return self.response
+
+        gltf2loader.requests.get = fake_get
+
+    def test_exact_content_length(self):
+        self._respond_with(BODY, {'Content-Length': str(len(BODY))})
+        data = load_uri('http://example.com/buffer.bin')
+        self.assertIsInstance(data, bytearray)
+        self.assertEqual(bytes(data), BODY)
+        self.assertTrue(self.response.closed)
+
+    def test_short_read(self):
+        self._respond_with(BODY, {'Content-Length': str(len(BODY) + 10)})
+        self.assertIsNone(load_uri('http://example.com/buffer.bin'))
+        self.assertTrue(self.response.closed)
+
+    def test_overflow(self):
+        self._respond_with(BODY, {'Content-Length': str(len(BODY) - 10)})
+        self.assertIsNone(load_uri('http://example.com/buffer.bin'))
+        self.assertTrue(self.response.closed)
+
+    def test_content_encoding_falls_back_to_content(self):
+        self._respond_with(BODY, {'Content-Length': '40', 'Content-Encoding': 'gzip'})
+        self.assertEqual(load_uri('http://example.com/buffer.bin'), BODY)
+        self.assertTrue(self.response.closed)
+
+    def test_missing_content_length_falls_back_to_content(self):
+        self._respond_with(BODY, {})
+        self.assertEqual(load_uri('http://example.com/buffer.bin'), BODY)
+        self.assertTrue(self.response.closed)
+
+    def test_http_error(self):
+        self._respond_with(b'', {}, status_code=404)
+        self.assertIsNone(load_uri('http://example.com/buffer.bin'))
+        self.assertTrue(self.response.closed)
+
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestLoadUri)
+    unittest.TextTestRunner(verbosity=2).run(suite)